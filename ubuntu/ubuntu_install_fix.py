@@ -1,15 +1,50 @@
 #!/usr/bin/env python3
 # Fix Ubuntu dependency conflicts for AutoCAD client
-# Run: python3 fix_ubuntu_dependencies.py
+# Run: python3 ubuntu_install_fix.py
+# Single-file bundle:
+#   mkdir -p build && cp ubuntu_install_fix.py build/
+#   python3 -m zipapp build -p "/usr/bin/env python3" -m "ubuntu_install_fix:main" -o dlarc-fix.pyz
+#   ./dlarc-fix.pyz
 
+import argparse
+import importlib.util
+import py_compile
+import shutil
 import subprocess
 import sys
 import os
+import tempfile
 from pathlib import Path
 
+# When bundled with `python -m zipapp`, __file__ points inside the .pyz archive
+ZIPAPP_PATH = os.path.dirname(__file__) if os.path.dirname(__file__).endswith('.pyz') else None
+SCRIPT_INVOCATION = f"./{os.path.basename(ZIPAPP_PATH)}" if ZIPAPP_PATH else "python3 ubuntu_install_fix.py"
+
+def spawn_command(cmd):
+    """Run a command via posix_spawn and return (returncode, stdout, stderr)"""
+    # posix_spawn skips fork()'s page-table copy, which adds up on
+    # large-memory hosts across the several pip launches this script does
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        pid = os.posix_spawnp(cmd[0], cmd, os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, out.fileno(), 1),
+            (os.POSIX_SPAWN_DUP2, err.fileno(), 2),
+        ])
+        _, status = os.waitpid(pid, 0)
+        out.seek(0)
+        err.seek(0)
+        return (
+            os.waitstatus_to_exitcode(status),
+            out.read().decode(errors='replace'),
+            err.read().decode(errors='replace'),
+        )
+
 def run_command(cmd, shell=False):
     """Run a command and return success status"""
     try:
+        if not shell and hasattr(os, 'posix_spawnp') and hasattr(os, 'waitstatus_to_exitcode'):
+            returncode, stdout, stderr = spawn_command(cmd)
+            return (True, stdout) if returncode == 0 else (False, stderr)
+        
         if shell:
             result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
         else:
@@ -22,7 +57,20 @@ def run_command(cmd, shell=False):
     except Exception as e:
         return False, str(e)
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Fix Ubuntu dependency conflicts for the AutoCAD client")
+    parser.add_argument('--yes', action='store_true',
+                        help="create a virtual environment without prompting")
+    parser.add_argument('--no-venv', action='store_true',
+                        help="install into the current environment without prompting")
+    parser.add_argument('--wheels-dir',
+                        help="install from a local directory of wheels instead of the package index")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("="*60)
     print("Ubuntu AutoCAD Client - Dependency Fix")
     print("="*60)
@@ -34,7 +82,15 @@ def main():
         print("\n⚠️  Not in a virtual environment!")
         print("It's recommended to use a virtual environment to avoid conflicts.")
         
-        response = input("\nDo you want to create a virtual environment? (y/n): ").lower()
+        if args.yes:
+            response = 'y'
+        elif args.no_venv:
+            response = 'n'
+        elif not sys.stdin.isatty():
+            # Piped / CI runs cannot answer the prompt
+            response = 'y'
+        else:
+            response = input("\nDo you want to create a virtual environment? (y/n): ").lower()
         
         if response == 'y':
             print("\nCreating virtual environment...")
@@ -44,7 +100,12 @@ def main():
             if not success:
                 print(f"Failed to create venv: {output}")
                 print("\nTrying with python3-venv package...")
-                run_command(["sudo", "apt", "install", "-y", "python3-venv"])
+                # Let apt-get stream its progress straight to the terminal
+                if shutil.which("apt-get"):
+                    subprocess.run(
+                        ["sudo", "apt-get", "install", "-y", "--no-install-recommends", "python3-venv"],
+                        check=False
+                    )
                 success, output = run_command([sys.executable, "-m", "venv", "venv"])
                 
             if success:
@@ -78,12 +139,22 @@ def main():
     print("\n2. Installing compatible versions...")
     for package, version in packages:
         print(f"   Installing {package}=={version}...")
+        # Wheels only: a missing wheel fails fast instead of silently
+        # falling back to a slow sdist build
         success, output = run_command([
-            sys.executable, "-m", "pip", "install", f"{package}=={version}"
+            sys.executable, "-m", "pip", "install",
+            "--only-binary=:all:", "--prefer-binary",
+            *(["--no-index", "--find-links", args.wheels_dir] if args.wheels_dir else []),
+            f"{package}=={version}"
         ])
         
         if success:
             print(f"   ✓ {package} {version} installed")
+        elif "Could not find a version that satisfies" in output:
+            print(f"   ✗ No prebuilt wheel of {package}=={version} for this platform")
+            print("     To build it from source instead, install the toolchain and retry without wheels-only:")
+            print("       sudo apt-get install -y python3-dev build-essential")
+            print(f"       {sys.executable} -m pip install {package}=={version}")
         else:
             print(f"   ✗ Failed to install {package}: {output}")
     
@@ -119,13 +190,14 @@ def main():
         "asyncio"
     ]
     
+    # find_spec only resolves the module location; it never runs the
+    # package __init__, so probing stays cheap for httpx/websockets/rich
     all_ok = True
     for module in test_imports:
-        try:
-            __import__(module)
-            print(f"   ✓ {module} imported successfully")
-        except ImportError as e:
-            print(f"   ✗ Failed to import {module}: {e}")
+        if importlib.util.find_spec(module) is not None:
+            print(f"   ✓ {module} is importable")
+        else:
+            print(f"   ✗ Cannot find {module}")
             all_ok = False
     
     # Create a test script
@@ -137,48 +209,74 @@ def main():
         # Create test connection script
         test_script = '''#!/usr/bin/env python3
 import asyncio
+import importlib.util
 import httpx
 
+# httpx only negotiates HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+async def probe(client, server_ip, port, name):
+    """Probe one server's /health endpoint and return (name, ok, info)"""
+    try:
+        response = await client.get(f"http://{server_ip}:{port}/health")
+        if response.status_code == 200:
+            return name, True, response.json()
+        return name, False, f"HTTP {response.status_code}"
+    except httpx.ConnectError:
+        return name, False, f"Cannot connect to {server_ip}:{port}"
+    except Exception as e:
+        return name, False, f"Error: {e}"
+
 async def test_connection():
     """Test connection to Windows AutoCAD server"""
     server_ip = input("Enter Windows server IP [192.168.1.193]: ").strip() or "192.168.1.193"
     
     print(f"\\nTesting connection to {server_ip}...")
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            response = await client.get(f"http://{server_ip}:8000/health")
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ AutoCAD Server: {data}")
-            else:
-                print(f"✗ AutoCAD Server: HTTP {response.status_code}")
-        except httpx.ConnectError:
-            print(f"✗ Cannot connect to {server_ip}:8000")
-            print("  Make sure the Windows server is running")
-        except Exception as e:
-            print(f"✗ Error: {e}")
-        
-        try:
-            response = await client.get(f"http://{server_ip}:8001/health")
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ ETABS Server: {data}")
-            else:
-                print(f"✗ ETABS Server: HTTP {response.status_code}")
-        except httpx.ConnectError:
-            print(f"✗ Cannot connect to {server_ip}:8001")
-        except Exception as e:
-            print(f"✗ Error: {e}")
+    async with httpx.AsyncClient(
+        timeout=5.0,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+    ) as client:
+        # Probe both servers at once so the wait is the slower of the two
+        results = await asyncio.gather(
+            probe(client, server_ip, 8000, "AutoCAD"),
+            probe(client, server_ip, 8001, "ETABS"),
+            return_exceptions=True,
+        )
+    
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"✗ Error: {result}")
+            continue
+        name, ok, info = result
+        if ok:
+            print(f"✓ {name} Server: {info}")
+        else:
+            print(f"✗ {name} Server: {info}")
+            if name == "AutoCAD" and info.startswith("Cannot connect"):
+                print("  Make sure the Windows server is running")
 
 if __name__ == "__main__":
     asyncio.run(test_connection())
 '''
         
-        with open('test_connection.py', 'w') as f:
+        # Set the executable mode at creation instead of a follow-up chmod
+        # (always into the working directory, never next to a .pyz bundle)
+        test_connection_path = Path.cwd() / 'test_connection.py'
+        fd = os.open(test_connection_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+        # The creation mode is masked by the umask and skipped for an
+        # existing file, so set it on the open descriptor as well
+        os.fchmod(fd, 0o755)
+        with os.fdopen(fd, 'w') as f:
             f.write(test_script)
         
-        os.chmod('test_connection.py', 0o755)
+        # Pre-compile for the current interpreter so the bytecode is cached
+        # in __pycache__ (used by imports and `python -m test_connection`)
+        try:
+            py_compile.compile(str(test_connection_path), doraise=True)
+        except py_compile.PyCompileError as e:
+            print(f"⚠️  Could not pre-compile test_connection.py: {e.msg}")
         
         print("\nCreated test_connection.py")
         print("Run it to test connection to Windows server:")
@@ -198,7 +296,7 @@ if __name__ == "__main__":
         print("\nTry creating a fresh virtual environment:")
         print("  python3 -m venv fresh_venv")
         print("  source fresh_venv/bin/activate")
-        print("  python3 fix_ubuntu_dependencies.py")
+        print(f"  {SCRIPT_INVOCATION}")
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
 # OS: Ubuntu with Ollama/CodeLlama integration
-# Setup: pip install httpx asyncio websockets rich ollama
+# Setup: pip install httpx asyncio websockets rich numpy ollama msgspec numba uvloop
 # Run: python unified_ollama_client.py
 # This integrates Ollama LLM with both AutoCAD and ETABS clients
 
 import asyncio
+import copy
+import functools
 import httpx
+import importlib.util
 import json
+import numpy as np
 import re
+import sys
+import threading
 from typing import List, Dict, Any, Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
 import logging
+from collections import OrderedDict
 
 # Try to import ollama
 try:
@@ -23,6 +30,67 @@ except ImportError:
     OLLAMA_AVAILABLE = False
     print("Warning: ollama not installed. Install with: pip install ollama")
 
+# msgspec decodes/encodes JSON much faster than the stdlib json module
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+    _DEC = msgspec.json.Decoder()
+    _ENC = msgspec.json.Encoder()
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+def json_decode(data):
+    """Decode JSON from str or bytes"""
+    if MSGSPEC_AVAILABLE:
+        return _DEC.decode(data.encode() if isinstance(data, str) else data)
+    return json.loads(data)
+
+def json_encode(obj) -> bytes:
+    """Encode an object to JSON bytes for an HTTP request body"""
+    if MSGSPEC_AVAILABLE:
+        return _ENC.encode(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Request bodies above this size are sent in STREAM_CHUNK_SIZE pieces
+STREAM_THRESHOLD = 1 << 20
+STREAM_CHUNK_SIZE = 64 * 1024
+
+async def iter_body_chunks(body: bytes):
+    """Yield an encoded request body in fixed-size chunks"""
+    view = memoryview(body)
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield bytes(view[start:start + STREAM_CHUNK_SIZE])
+
+# Numba compiles the frame coordinate loops when installed
+try:
+    import numba
+    from numba import prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+# uvloop replaces the asyncio event loop with a libuv-based one when installed
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def make_http_client() -> httpx.AsyncClient:
+    """Create a long-lived client whose keep-alive pool is reused across requests"""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16,
+                            keepalive_expiry=60.0)
+    )
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,59 +98,408 @@ WINDOWS_SERVER = "192.168.1.193"
 AUTOCAD_BASE = f"http://{WINDOWS_SERVER}:8000"
 ETABS_BASE = f"http://{WINDOWS_SERVER}:8001"
 
+# Single ETABS objects are queued and sent together once this many are
+# pending, on an explicit `flush`, or when the prompt sits idle
+BATCH_FLUSH_SIZE = 64
+IDLE_FLUSH_SECONDS = 0.1
+
+# Idle connections are pinged this often so intermediaries don't drop them
+KEEPALIVE_INTERVAL = 20.0
+
+# Patterns used by the LLM-free parser, compiled once at import
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+_DIM_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:m|meters?)?\s*(?:by|x)\s*(\d+(?:\.\d+)?)')
+_FLOOR_RE = re.compile(r'(\d+)\s*(?:floor|story|storey)')
+_HEIGHT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*m(?:eter)?\s*(?:height|tall|floor\s*height)')
+
+# Keyword lists become one alternation each, so detection is a single
+# scan of the prompt (still substring matching, e.g. "columns" -> column)
+_ETABS_KEYWORDS_RE = re.compile('structure|structural|frame|column|beam|slab|etabs|analysis')
+_AUTOCAD_KEYWORDS_RE = re.compile('drawing|visual|autocad|circle|line')
+_BUILDING_KEYWORDS_RE = re.compile('building|structure|tower|frame')
+
+# Number of distinct LLM prompts whose parsed commands are remembered
+LLM_CACHE_SIZE = 128
+
 console = Console()
 
-class AutoCADClient:
-    """AutoCAD client for communication with Windows server"""
+def show_command(label: str, command: Dict[str, Any]):
+    """Print a parsed command, truncating commands that carry large object lists"""
+    objects = command.get("objects")
+    if isinstance(objects, list) and len(objects) > 20:
+        # Skip Rich's pretty-printing of thousands of dicts; a short
+        # serialized preview is enough to confirm the interpretation
+        preview = json_encode(command)[:512].decode(errors="ignore")
+        console.print(f"{label} {preview}... ({len(objects)} objects)",
+                      style="cyan", markup=False, highlight=False)
+        return
+    
+    text = f"{label} {command}"
+    if len(text) > 2000:
+        # Rich's regex highlighter gets slow on long repr strings
+        console.print(text, style="cyan", markup=False, highlight=False)
+    else:
+        console.print(f"[cyan]{text}[/cyan]")
+
+def _frame_coords_numpy(nx: int, ny: int, floors: int, bay_spacing: float,
+                        floor_height: float) -> tuple:
+    """Frame line/area coordinate arrays built with NumPy broadcasting"""
+    xs = np.arange(nx) * bay_spacing
+    ys = np.arange(ny) * bay_spacing
+    zs = np.arange(floors + 1) * floor_height
+    
+    # Columns, one per grid point per storey, ordered (i, j, k)
+    ci, cj, ck = np.indices((nx, ny, floors)).reshape(3, -1)
+    col_x, col_y, col_z = xs[ci], ys[cj], zs[ck]
+    
+    # Beam plan (X-direction then Y-direction), repeated on every floor
+    bxi, bxj = np.indices((nx - 1, ny)).reshape(2, -1)
+    byi, byj = np.indices((nx, ny - 1)).reshape(2, -1)
+    plan_xs = np.concatenate([np.stack([xs[bxi], xs[bxi + 1]], axis=1),
+                              np.stack([xs[byi], xs[byi]], axis=1)])
+    plan_ys = np.concatenate([np.stack([ys[bxj], ys[bxj]], axis=1),
+                              np.stack([ys[byj], ys[byj + 1]], axis=1)])
+    beam_zs = np.repeat(zs[1:], len(plan_xs))
+    
+    # Slabs, one per bay per floor
+    si, sj = np.indices((nx - 1, ny - 1)).reshape(2, -1)
+    x1, x2, y1, y2 = xs[si], xs[si + 1], ys[sj], ys[sj + 1]
+    slab_zs = np.repeat(zs[1:], len(si))
+    
+    return (
+        np.concatenate([np.stack([col_x, col_x], axis=1), np.tile(plan_xs, (floors, 1))]),
+        np.concatenate([np.stack([col_y, col_y], axis=1), np.tile(plan_ys, (floors, 1))]),
+        np.concatenate([np.stack([col_z, col_z + floor_height], axis=1),
+                        np.stack([beam_zs, beam_zs], axis=1)]),
+        np.tile(np.stack([x1, x2, x2, x1], axis=1), (floors, 1)),
+        np.tile(np.stack([y1, y1, y2, y2], axis=1), (floors, 1)),
+        np.stack([slab_zs] * 4, axis=1),
+    )
+
+def _frame_coords_loops(nx, ny, floors, bay_spacing, floor_height):
+    """Frame line/area coordinate arrays filled by index (compiled with Numba)"""
+    ncols = nx * ny * floors
+    nxb = (nx - 1) * ny
+    nplan = nxb + nx * (ny - 1)
+    nslab = (nx - 1) * (ny - 1)
+    nlines = ncols + nplan * floors
+    
+    line_xs = np.empty((nlines, 2))
+    line_ys = np.empty((nlines, 2))
+    line_zs = np.empty((nlines, 2))
+    area_xs = np.empty((nslab * floors, 4))
+    area_ys = np.empty((nslab * floors, 4))
+    area_zs = np.empty((nslab * floors, 4))
+    
+    # Columns, ordered (i, j, k)
+    for i in prange(nx):
+        x = i * bay_spacing
+        for j in range(ny):
+            y = j * bay_spacing
+            for k in range(floors):
+                p = (i * ny + j) * floors + k
+                z = k * floor_height
+                line_xs[p, 0] = x
+                line_xs[p, 1] = x
+                line_ys[p, 0] = y
+                line_ys[p, 1] = y
+                line_zs[p, 0] = z
+                line_zs[p, 1] = z + floor_height
+    
+    # Beams and slabs, floor by floor
+    for f in prange(floors):
+        z = (f + 1) * floor_height
+        
+        base = ncols + f * nplan
+        for i in range(nx - 1):
+            for j in range(ny):
+                p = base + i * ny + j
+                line_xs[p, 0] = i * bay_spacing
+                line_xs[p, 1] = (i + 1) * bay_spacing
+                line_ys[p, 0] = j * bay_spacing
+                line_ys[p, 1] = j * bay_spacing
+                line_zs[p, 0] = z
+                line_zs[p, 1] = z
+        
+        base += nxb
+        for i in range(nx):
+            for j in range(ny - 1):
+                p = base + i * (ny - 1) + j
+                line_xs[p, 0] = i * bay_spacing
+                line_xs[p, 1] = i * bay_spacing
+                line_ys[p, 0] = j * bay_spacing
+                line_ys[p, 1] = (j + 1) * bay_spacing
+                line_zs[p, 0] = z
+                line_zs[p, 1] = z
+        
+        for i in range(nx - 1):
+            for j in range(ny - 1):
+                p = f * nslab + i * (ny - 1) + j
+                x1 = i * bay_spacing
+                x2 = (i + 1) * bay_spacing
+                y1 = j * bay_spacing
+                y2 = (j + 1) * bay_spacing
+                area_xs[p, 0] = x1
+                area_xs[p, 1] = x2
+                area_xs[p, 2] = x2
+                area_xs[p, 3] = x1
+                area_ys[p, 0] = y1
+                area_ys[p, 1] = y1
+                area_ys[p, 2] = y2
+                area_ys[p, 3] = y2
+                for c in range(4):
+                    area_zs[p, c] = z
+    
+    return line_xs, line_ys, line_zs, area_xs, area_ys, area_zs
+
+# The index-filling loops only pay off when compiled; without Numba the
+# broadcasting version is used instead
+if NUMBA_AVAILABLE:
+    _build_frame_coords = numba.njit(parallel=True, cache=True)(_frame_coords_loops)
+else:
+    _build_frame_coords = _frame_coords_numpy
+
+def build_frame_columns(nx: int, ny: int, floors: int, bay_spacing: float,
+                        floor_height: float) -> tuple:
+    """Build a frame's lines and slab areas as columnar (struct-of-arrays) payloads"""
+    line_xs, line_ys, line_zs, area_xs, area_ys, area_zs = _build_frame_coords(
+        nx, ny, floors, float(bay_spacing), float(floor_height))
+    floor_ids = [str(k) for k in range(1, floors + 1)]
+    
+    col_ids = ['COL_%d_%d_%d' % ijk
+               for ijk in zip(*np.indices((nx, ny, floors)).reshape(3, -1).tolist())]
+    plan_ids = (['BEAM_X_%d_%d_' % ij for ij in zip(*np.indices((nx - 1, ny)).reshape(2, -1).tolist())] +
+                ['BEAM_Y_%d_%d_' % ij for ij in zip(*np.indices((nx, ny - 1)).reshape(2, -1).tolist())])
+    slab_ids = ['SLAB_%d_%d_' % ij for ij in zip(*np.indices((nx - 1, ny - 1)).reshape(2, -1).tolist())]
+    
+    lines = {
+        "xs": line_xs.tolist(),
+        "ys": line_ys.tolist(),
+        "zs": line_zs.tolist(),
+        "ids": col_ids + [prefix + k for k in floor_ids for prefix in plan_ids]
+    }
+    areas = {
+        "xs": area_xs.tolist(),
+        "ys": area_ys.tolist(),
+        "zs": area_zs.tolist(),
+        "ids": [prefix + k for k in floor_ids for prefix in slab_ids]
+    }
+    return lines, areas
+
+@functools.lru_cache(maxsize=256)
+def parse_prompt_patterns(prompt: str, current_app: Optional[str]) -> Dict[str, Any]:
+    """Parse without LLM using patterns (memoized - copy before mutating)"""
+    prompt_lower = prompt.lower()
+    
+    # Detect which app to use
+    use_etabs = _ETABS_KEYWORDS_RE.search(prompt_lower) is not None
+    use_autocad = _AUTOCAD_KEYWORDS_RE.search(prompt_lower) is not None
+    
+    # Default to last used app or AutoCAD
+    if not use_etabs and not use_autocad:
+        use_autocad = True if current_app != "etabs" else False
+        use_etabs = not use_autocad
+    
+    # Extract numbers
+    numbers = _NUM_RE.findall(prompt)
+    
+    # Building/Structure detection
+    if _BUILDING_KEYWORDS_RE.search(prompt_lower):
+        result = {
+            "app": "etabs" if use_etabs else "autocad",
+            "action": "frame" if use_etabs else "building_3d",
+            "floors": 1,
+            "length": 30,
+            "width": 20,
+            "floor_height": 3.5
+        }
+        
+        # Extract dimensions
+        dim_match = _DIM_RE.search(prompt_lower)
+        if dim_match:
+            result["length"] = float(dim_match.group(1))
+            result["width"] = float(dim_match.group(2))
+        elif numbers and len(numbers) >= 2:
+            result["length"] = float(numbers[0])
+            result["width"] = float(numbers[1])
+        
+        # Extract floors
+        floor_match = _FLOOR_RE.search(prompt_lower)
+        if floor_match:
+            result["floors"] = int(floor_match.group(1))
+        
+        # Extract height
+        height_match = _HEIGHT_RE.search(prompt_lower)
+        if height_match:
+            result["floor_height"] = float(height_match.group(1))
+        
+        # Check if 2D (AutoCAD only)
+        if '2d' in prompt_lower or 'plan' in prompt_lower:
+            result["app"] = "autocad"
+            result["action"] = "building_2d"
+            del result["floors"]
+            del result["floor_height"]
+        
+        return result
+    
+    # Column detection (ETABS)
+    elif 'column' in prompt_lower:
+        result = {"app": "etabs", "action": "column", "x": 0, "y": 0, "height": 3.5}
+        if numbers:
+            if len(numbers) >= 3:
+                result["x"] = float(numbers[0])
+                result["y"] = float(numbers[1])
+                result["height"] = float(numbers[2])
+            elif len(numbers) == 1:
+                result["height"] = float(numbers[0])
+        return result
+    
+    # Beam detection (ETABS)
+    elif 'beam' in prompt_lower:
+        result = {
+            "app": "etabs",
+            "action": "beam",
+            "start": [0, 0, 3.5],
+            "end": [6, 0, 3.5]
+        }
+        if numbers and len(numbers) >= 4:
+            result["start"] = [float(numbers[0]), float(numbers[1]), 3.5]
+            result["end"] = [float(numbers[2]), float(numbers[3]), 3.5]
+        return result
+    
+    # Line detection (AutoCAD)
+    elif 'line' in prompt_lower:
+        result = {"app": "autocad", "action": "line", "start": [0, 0, 0], "end": [10, 10, 0]}
+        if numbers and len(numbers) >= 2:
+            result["end"] = [float(numbers[0]), float(numbers[1]), 0]
+        if len(numbers) >= 4:
+            result["start"] = [float(numbers[0]), float(numbers[1]), 0]
+            result["end"] = [float(numbers[2]), float(numbers[3]), 0]
+        return result
+    
+    # Circle detection (AutoCAD)
+    elif 'circle' in prompt_lower:
+        result = {"app": "autocad", "action": "circle", "center": [0, 0, 0], "radius": 5}
+        if numbers:
+            result["radius"] = float(numbers[-1])
+            if len(numbers) >= 3:
+                result["center"] = [float(numbers[0]), float(numbers[1]), 0]
+        return result
+    
+    return {"action": "unknown", "error": "Could not parse command"}
+
+class JsonObjectScanner:
+    """Find the first complete top-level JSON object in text fed piece by piece"""
+    __slots__ = ("parts", "depth", "in_string", "escape")
+    
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-        self.connected = False
+        self.parts: List[str] = []
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
         
+    def feed(self, text: str) -> Optional[str]:
+        """Consume more text; return the object's source once its closing brace arrives"""
+        # Offset in this chunk where the object (or its continuation) starts
+        start = 0
+        for pos, ch in enumerate(text):
+            if self.depth == 0:
+                # Skip prose and code fences until the object opens
+                if ch != '{':
+                    continue
+                start = pos
+            
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.parts.append(text[start:pos + 1])
+                    return ''.join(self.parts)
+        
+        if self.depth > 0:
+            self.parts.append(text[start:])
+        return None
+
+class _HttpBase:
+    """Shared HTTP plumbing for the AutoCAD and ETABS clients"""
+    __slots__ = ("http_client", "connected")
+    
+    def __init__(self):
+        self.http_client = make_http_client()
+        self.connected = False
+    
+    async def _post_body(self, url: str, body: bytes) -> httpx.Response:
+        if len(body) > STREAM_THRESHOLD:
+            # Large frames are streamed so sending overlaps with slicing
+            # instead of handing the transport one multi-megabyte buffer
+            return await self.http_client.post(
+                url,
+                content=iter_body_chunks(body),
+                headers={**JSON_HEADERS, "Content-Length": str(len(body))}
+            )
+        return await self.http_client.post(url, content=body, headers=JSON_HEADERS)
+    
+    async def _post(self, url: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if payload is None:
+            response = await self.http_client.post(url)
+        else:
+            response = await self._post_body(url, json_encode(payload))
+        response.raise_for_status()
+        # Decode the raw bytes directly rather than bytes -> str -> dict
+        return json_decode(response.content)
+    
+    async def _get(self, url: str) -> Dict[str, Any]:
+        response = await self.http_client.get(url)
+        response.raise_for_status()
+        return json_decode(response.content)
+    
+    async def close(self):
+        await self.http_client.aclose()
+
+class AutoCADClient(_HttpBase):
+    """AutoCAD client for communication with Windows server"""
+    __slots__ = ()
+    
     async def connect_http(self) -> Dict[str, Any]:
         try:
-            response = await self.http_client.post(f"{AUTOCAD_BASE}/connect")
-            response.raise_for_status()
+            result = await self._post(f"{AUTOCAD_BASE}/connect")
             self.connected = True
-            return response.json()
+            return result
         except Exception as e:
             return {"success": False, "message": str(e)}
     
     async def new_drawing(self) -> Dict[str, Any]:
-        response = await self.http_client.post(f"{AUTOCAD_BASE}/new_drawing")
-        response.raise_for_status()
-        return response.json()
+        return await self._post(f"{AUTOCAD_BASE}/new_drawing")
     
     async def draw_line(self, start: List[float], end: List[float]) -> Dict[str, Any]:
-        response = await self.http_client.post(
-            f"{AUTOCAD_BASE}/draw_line",
-            json={"start": start, "end": end}
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post(f"{AUTOCAD_BASE}/draw_line", {"start": start, "end": end})
     
     async def draw_circle(self, center: List[float], radius: float) -> Dict[str, Any]:
-        response = await self.http_client.post(
-            f"{AUTOCAD_BASE}/draw_circle",
-            json={"center": center, "radius": radius}
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post(f"{AUTOCAD_BASE}/draw_circle", {"center": center, "radius": radius})
     
     async def create_building_2d(self, length: float, width: float, 
                                  bay_spacing: float = 6.0) -> Dict[str, Any]:
-        response = await self.http_client.post(
+        return await self._post(
             f"{AUTOCAD_BASE}/create_building_2d",
-            json={"length": length, "width": width, "bay_spacing": bay_spacing}
+            {"length": length, "width": width, "bay_spacing": bay_spacing}
         )
-        response.raise_for_status()
-        return response.json()
     
     async def create_building_3d(self, floors: int, length: float, width: float,
                                  bay_spacing: float = 6.0, 
                                  floor_height: float = 3.5) -> Dict[str, Any]:
-        response = await self.http_client.post(
+        return await self._post(
             f"{AUTOCAD_BASE}/create_building_3d",
-            json={
+            {
                 "floors": floors,
                 "length": length,
                 "width": width,
@@ -90,143 +507,126 @@ class AutoCADClient:
                 "floor_height": floor_height
             }
         )
-        response.raise_for_status()
-        return response.json()
     
     async def save_drawing(self, filename: str) -> Dict[str, Any]:
-        response = await self.http_client.post(
-            f"{AUTOCAD_BASE}/save_drawing",
-            json={"filename": filename}
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post(f"{AUTOCAD_BASE}/save_drawing", {"filename": filename})
     
     async def zoom_extents(self) -> Dict[str, Any]:
-        response = await self.http_client.post(f"{AUTOCAD_BASE}/zoom_extents")
-        response.raise_for_status()
-        return response.json()
-    
-    async def close(self):
-        await self.http_client.aclose()
+        return await self._post(f"{AUTOCAD_BASE}/zoom_extents")
 
-class ETABSClient:
+class ETABSClient(_HttpBase):
     """ETABS client for communication with Windows server"""
+    __slots__ = ("columnar_supported",)
+    
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-        self.connected = False
+        super().__init__()
+        # Set from the server's advertised capabilities on connect
+        self.columnar_supported = False
         
     async def connect(self) -> Dict[str, Any]:
         try:
-            response = await self.http_client.post(f"{ETABS_BASE}/connect")
-            response.raise_for_status()
+            result = await self._post(f"{ETABS_BASE}/connect")
             self.connected = True
-            return response.json()
+            self.columnar_supported = "create_objects_columnar" in result.get("capabilities", [])
+            return result
         except Exception as e:
             return {"success": False, "message": str(e)}
     
     async def get_units(self) -> Dict[str, Any]:
-        response = await self.http_client.get(f"{ETABS_BASE}/units")
-        response.raise_for_status()
-        return response.json()
+        return await self._get(f"{ETABS_BASE}/units")
     
     async def create_objects(self, objects: List[Dict[str, Any]]) -> Dict[str, Any]:
-        response = await self.http_client.post(
-            f"{ETABS_BASE}/create_objects",
-            json={"objects": objects}
+        return await self._post(f"{ETABS_BASE}/create_objects", {"objects": objects})
+    
+    async def create_objects_columnar(self, lines: Dict[str, list],
+                                      areas: Dict[str, list]) -> Dict[str, Any]:
+        """Create objects from columnar payloads ({"xs", "ys", "zs", "ids"} per type)"""
+        return await self._post(
+            f"{ETABS_BASE}/create_objects_columnar",
+            {"lines": lines, "areas": areas}
         )
-        response.raise_for_status()
-        return response.json()
     
     async def create_frame_structure(self, floors: int, length: float, width: float,
                                     bay_spacing: float = 6.0, 
                                     floor_height: float = 3.5) -> Dict[str, Any]:
         """Create a structural frame in ETABS"""
-        objects = []
-        
         # Calculate grid points
         nx = int(length / bay_spacing) + 1
         ny = int(width / bay_spacing) + 1
         
-        # Create columns (vertical lines)
-        for i in range(nx):
-            x = i * bay_spacing
-            for j in range(ny):
-                y = j * bay_spacing
-                for k in range(floors + 1):
-                    z = k * floor_height
-                    if k < floors:
-                        # Column from this floor to next
-                        objects.append({
-                            "type": "line",
-                            "xs": [x, x],
-                            "ys": [y, y],
-                            "zs": [z, z + floor_height],
-                            "id": f"COL_{i}_{j}_{k}"
-                        })
-        
-        # Create beams (horizontal lines) at each floor
-        for k in range(1, floors + 1):
-            z = k * floor_height
-            
-            # X-direction beams
-            for i in range(nx - 1):
-                x1 = i * bay_spacing
-                x2 = (i + 1) * bay_spacing
-                for j in range(ny):
-                    y = j * bay_spacing
-                    objects.append({
-                        "type": "line",
-                        "xs": [x1, x2],
-                        "ys": [y, y],
-                        "zs": [z, z],
-                        "id": f"BEAM_X_{i}_{j}_{k}"
-                    })
-            
-            # Y-direction beams
-            for i in range(nx):
-                x = i * bay_spacing
-                for j in range(ny - 1):
-                    y1 = j * bay_spacing
-                    y2 = (j + 1) * bay_spacing
-                    objects.append({
-                        "type": "line",
-                        "xs": [x, x],
-                        "ys": [y1, y2],
-                        "zs": [z, z],
-                        "id": f"BEAM_Y_{i}_{j}_{k}"
-                    })
-            
-            # Create floor slabs (area elements)
-            for i in range(nx - 1):
-                x1 = i * bay_spacing
-                x2 = (i + 1) * bay_spacing
-                for j in range(ny - 1):
-                    y1 = j * bay_spacing
-                    y2 = (j + 1) * bay_spacing
-                    objects.append({
-                        "type": "area",
-                        "xs": [x1, x2, x2, x1],
-                        "ys": [y1, y1, y2, y2],
-                        "zs": [z, z, z, z],
-                        "id": f"SLAB_{i}_{j}_{k}"
-                    })
+        # Coordinates and ids come back as parallel arrays, one per field
+        lines, areas = build_frame_columns(nx, ny, floors, bay_spacing, floor_height)
+        
+        if self.columnar_supported:
+            # Send one array per field instead of repeating the keys per object
+            return await self.create_objects_columnar(lines, areas)
+        
+        # One contiguous comprehension per element type over the arrays
+        line_objects = [
+            {"type": "line", "xs": xs, "ys": ys, "zs": zs, "id": obj_id}
+            for xs, ys, zs, obj_id in zip(lines["xs"], lines["ys"], lines["zs"], lines["ids"])
+        ]
+        area_objects = [
+            {"type": "area", "xs": xs, "ys": ys, "zs": zs, "id": obj_id}
+            for xs, ys, zs, obj_id in zip(areas["xs"], areas["ys"], areas["zs"], areas["ids"])
+        ]
+        
+        # Keep the established order: all columns, then per floor its X/Y
+        # beams followed by its slabs
+        ncols = nx * ny * floors
+        nplan = (nx - 1) * ny + nx * (ny - 1)
+        nslab = (nx - 1) * (ny - 1)
+        objects = line_objects[:ncols]
+        for f in range(floors):
+            objects += line_objects[ncols + f * nplan:ncols + (f + 1) * nplan]
+            objects += area_objects[f * nslab:(f + 1) * nslab]
         
         return await self.create_objects(objects)
-    
-    async def close(self):
-        await self.http_client.aclose()
 
 class UnifiedCADInterpreter:
     """Unified interpreter for both AutoCAD and ETABS with Ollama/LLM"""
+    __slots__ = ("model", "autocad_client", "etabs_client", "current_app", "_etabs_pending",
+                 "_deferred_reports", "_ollama_client", "_llm_cache", "process_with_llm")
     
     def __init__(self, model="codellama:34b"):
         self.model = model
         self.autocad_client = AutoCADClient()
         self.etabs_client = ETABSClient()
         self.current_app = None  # Track which app is active
+        self._etabs_pending: List[Dict[str, Any]] = []
+        self._deferred_reports: List[str] = []
+        # One async client for the session: keeps the connection to the
+        # Ollama daemon alive and doesn't block the event loop during chat
+        self._ollama_client = ollama.AsyncClient() if OLLAMA_AVAILABLE else None
+        self._llm_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Pick the parsing strategy once instead of branching on every prompt
+        self.process_with_llm = self._process_with_ollama if OLLAMA_AVAILABLE else self._process_with_patterns
+        
+    async def _process_with_ollama(self, prompt: str) -> Dict[str, Any]:
+        """Process natural language with CodeLlama, reusing answers to repeated prompts"""
+        key = prompt.strip().lower()
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            self._llm_cache.move_to_end(key)
+            return copy.deepcopy(cached)
         
-    async def process_with_llm(self, prompt: str) -> Dict[str, Any]:
-        """Process natural language with CodeLlama"""
+        try:
+            command = await self._ask_ollama(prompt)
+        except Exception as e:
+            # Stay on pattern matching for the rest of the session instead
+            # of paying for a failing Ollama round-trip on every prompt
+            console.print(f"[yellow]Ollama error: {e}. Using pattern matching.[/yellow]")
+            self.process_with_llm = self._process_with_patterns
+            return self._parse_without_llm(prompt)
+        
+        if command.get("action") != "unknown":
+            self._llm_cache[key] = copy.deepcopy(command)
+            if len(self._llm_cache) > LLM_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+        return command
+    
+    async def _ask_ollama(self, prompt: str) -> Dict[str, Any]:
+        """Send a prompt to CodeLlama and parse the command from its reply"""
         
         system_message = """You are a CAD assistant for both AutoCAD and ETABS. Convert natural language to JSON commands.
 
@@ -251,149 +651,52 @@ Rules:
 
 Respond ONLY with JSON."""
 
-        if OLLAMA_AVAILABLE:
-            try:
-                client = ollama.Client()
-                response = client.chat(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                
-                llm_output = response['message']['content']
-                return self._parse_llm_response(llm_output)
-                
-            except Exception as e:
-                console.print(f"[yellow]Ollama error: {e}. Using pattern matching.[/yellow]")
-                return self._parse_without_llm(prompt)
-        else:
-            return self._parse_without_llm(prompt)
+        stream = await self._ollama_client.chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            stream=True
+        )
+        
+        # Stop reading as soon as the command object is complete
+        # rather than waiting for the rest of the completion
+        scanner = JsonObjectScanner()
+        chunks = []
+        try:
+            async for part in stream:
+                content = part['message']['content']
+                chunks.append(content)
+                command_json = scanner.feed(content)
+                if command_json is not None:
+                    return self._parse_llm_response(command_json)
+        finally:
+            await stream.aclose()
+        
+        llm_output = ''.join(chunks)
+        return self._parse_llm_response(llm_output)
+    
+    async def _process_with_patterns(self, prompt: str) -> Dict[str, Any]:
+        """Process natural language with pattern matching only"""
+        return self._parse_without_llm(prompt)
     
     def _parse_llm_response(self, response: str) -> Dict[str, Any]:
         """Extract JSON from LLM response"""
-        try:
-            response = response.strip()
-            if response.startswith("```"):
-                response = response.split("```")[1]
-                if response.startswith("json"):
-                    response = response[4:]
-            
-            return json.loads(response)
-        except:
-            match = re.search(r'\{[^}]+\}', response)
-            if match:
-                try:
-                    return json.loads(match.group())
-                except:
-                    pass
-            
-            return {"action": "unknown", "error": "Failed to parse LLM response"}
+        # One pass finds the first balanced object, whatever prose or code
+        # fences surround it, and handles nested braces
+        command_json = JsonObjectScanner().feed(response)
+        if command_json is not None:
+            try:
+                return json_decode(command_json)
+            except Exception:
+                pass
+        
+        return {"action": "unknown", "error": "Failed to parse LLM response"}
     
     def _parse_without_llm(self, prompt: str) -> Dict[str, Any]:
         """Parse without LLM using patterns"""
-        prompt_lower = prompt.lower()
-        
-        # Detect which app to use
-        etabs_keywords = ['structure', 'structural', 'frame', 'column', 'beam', 'slab', 'etabs', 'analysis']
-        autocad_keywords = ['drawing', 'visual', 'autocad', 'circle', 'line']
-        
-        use_etabs = any(keyword in prompt_lower for keyword in etabs_keywords)
-        use_autocad = any(keyword in prompt_lower for keyword in autocad_keywords)
-        
-        # Default to last used app or AutoCAD
-        if not use_etabs and not use_autocad:
-            use_autocad = True if self.current_app != "etabs" else False
-            use_etabs = not use_autocad
-        
-        # Extract numbers
-        numbers = re.findall(r'\d+(?:\.\d+)?', prompt)
-        
-        # Building/Structure detection
-        if any(word in prompt_lower for word in ['building', 'structure', 'tower', 'frame']):
-            result = {
-                "app": "etabs" if use_etabs else "autocad",
-                "action": "frame" if use_etabs else "building_3d",
-                "floors": 1,
-                "length": 30,
-                "width": 20,
-                "floor_height": 3.5
-            }
-            
-            # Extract dimensions
-            dim_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:m|meters?)?\s*(?:by|x)\s*(\d+(?:\.\d+)?)', prompt_lower)
-            if dim_match:
-                result["length"] = float(dim_match.group(1))
-                result["width"] = float(dim_match.group(2))
-            elif numbers and len(numbers) >= 2:
-                result["length"] = float(numbers[0])
-                result["width"] = float(numbers[1])
-            
-            # Extract floors
-            floor_match = re.search(r'(\d+)\s*(?:floor|story|storey)', prompt_lower)
-            if floor_match:
-                result["floors"] = int(floor_match.group(1))
-            
-            # Extract height
-            height_match = re.search(r'(\d+(?:\.\d+)?)\s*m(?:eter)?\s*(?:height|tall|floor\s*height)', prompt_lower)
-            if height_match:
-                result["floor_height"] = float(height_match.group(1))
-            
-            # Check if 2D (AutoCAD only)
-            if '2d' in prompt_lower or 'plan' in prompt_lower:
-                result["app"] = "autocad"
-                result["action"] = "building_2d"
-                del result["floors"]
-                del result["floor_height"]
-            
-            return result
-        
-        # Column detection (ETABS)
-        elif 'column' in prompt_lower:
-            result = {"app": "etabs", "action": "column", "x": 0, "y": 0, "height": 3.5}
-            if numbers:
-                if len(numbers) >= 3:
-                    result["x"] = float(numbers[0])
-                    result["y"] = float(numbers[1])
-                    result["height"] = float(numbers[2])
-                elif len(numbers) == 1:
-                    result["height"] = float(numbers[0])
-            return result
-        
-        # Beam detection (ETABS)
-        elif 'beam' in prompt_lower:
-            result = {
-                "app": "etabs",
-                "action": "beam",
-                "start": [0, 0, 3.5],
-                "end": [6, 0, 3.5]
-            }
-            if numbers and len(numbers) >= 4:
-                result["start"] = [float(numbers[0]), float(numbers[1]), 3.5]
-                result["end"] = [float(numbers[2]), float(numbers[3]), 3.5]
-            return result
-        
-        # Line detection (AutoCAD)
-        elif 'line' in prompt_lower:
-            result = {"app": "autocad", "action": "line", "start": [0, 0, 0], "end": [10, 10, 0]}
-            if numbers and len(numbers) >= 2:
-                result["end"] = [float(numbers[0]), float(numbers[1]), 0]
-            if len(numbers) >= 4:
-                result["start"] = [float(numbers[0]), float(numbers[1]), 0]
-                result["end"] = [float(numbers[2]), float(numbers[3]), 0]
-            return result
-        
-        # Circle detection (AutoCAD)
-        elif 'circle' in prompt_lower:
-            result = {"app": "autocad", "action": "circle", "center": [0, 0, 0], "radius": 5}
-            if numbers:
-                result["radius"] = float(numbers[-1])
-                if len(numbers) >= 3:
-                    result["center"] = [float(numbers[0]), float(numbers[1]), 0]
-            return result
-        
-        return {"action": "unknown", "error": "Could not parse command"}
+        return copy.deepcopy(parse_prompt_patterns(prompt, self.current_app))
     
     async def execute_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
         """Execute parsed command on appropriate application"""
@@ -447,26 +750,24 @@ Respond ONLY with JSON."""
                     console.print(f"[green]ETABS: Created structural frame[/green]")
                     
                 elif action == "column":
-                    objects = [{
+                    result = await self.queue_etabs_object({
                         "type": "line",
                         "xs": [command.get("x", 0), command.get("x", 0)],
                         "ys": [command.get("y", 0), command.get("y", 0)],
                         "zs": [0, command.get("height", 3.5)]
-                    }]
-                    result = await self.etabs_client.create_objects(objects)
-                    console.print(f"[green]ETABS: Created column[/green]")
+                    })
+                    console.print(f"[green]ETABS: Queued column[/green]")
                     
                 elif action == "beam":
                     start = command.get("start", [0, 0, 3.5])
                     end = command.get("end", [6, 0, 3.5])
-                    objects = [{
+                    result = await self.queue_etabs_object({
                         "type": "line",
                         "xs": [start[0], end[0]],
                         "ys": [start[1], end[1]],
                         "zs": [start[2], end[2]]
-                    }]
-                    result = await self.etabs_client.create_objects(objects)
-                    console.print(f"[green]ETABS: Created beam[/green]")
+                    })
+                    console.print(f"[green]ETABS: Queued beam[/green]")
             
             else:
                 result = {"success": False, "message": f"Unknown app: {app}"}
@@ -478,70 +779,171 @@ Respond ONLY with JSON."""
             console.print(f"[red]Error: {e}[/red]")
             return {"success": False, "message": str(e)}
 
+    async def queue_etabs_object(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a single ETABS object, flushing once the batch is full"""
+        self._etabs_pending.append(obj)
+        if len(self._etabs_pending) >= BATCH_FLUSH_SIZE:
+            return await self.flush_batch()
+        return {"success": True, "queued": len(self._etabs_pending)}
+    
+    async def flush_batch(self, quiet: bool = False) -> Dict[str, Any]:
+        """
+        Send all queued ETABS objects in one create_objects call. Objects
+        stay queued until the request goes through, so a failed send is
+        retried by the next flush. A quiet flush keeps its report for
+        show_deferred_reports().
+        """
+        if not self._etabs_pending:
+            return {"success": True, "created": 0}
+        
+        objects = list(self._etabs_pending)
+        try:
+            result = await self.etabs_client.create_objects(objects)
+        except Exception as e:
+            if not quiet:
+                raise
+            self._deferred_reports.append(
+                f"[red]Error: {e} ({len(objects)} object(s) still queued)[/red]")
+            return {"success": False, "message": str(e)}
+        del self._etabs_pending[:len(objects)]
+        if result.get("success"):
+            report = f"[green]ETABS: Created {len(objects)} queued object(s)[/green]"
+        else:
+            report = (f"[red]ETABS: Failed to create {len(objects)} queued object(s): "
+                      f"{result.get('message', 'unknown error')}[/red]")
+        if quiet:
+            self._deferred_reports.append(report)
+        else:
+            console.print(report)
+        return result
+    
+    def show_deferred_reports(self):
+        """Print what quiet flushes did since the last prompt"""
+        for report in self._deferred_reports:
+            console.print(report)
+        self._deferred_reports.clear()
+
+def _input_line(prompt: str) -> str:
+    """console.input, except piped stdin is read unbuffered"""
+    if sys.stdin.isatty():
+        return console.input(prompt)
+    # A read pending in the buffered reader holds its lock, which aborts
+    # interpreter shutdown; the raw file has no lock
+    console.print(prompt, end="")
+    line = sys.stdin.buffer.raw.readline()
+    if not line:
+        raise EOFError
+    return line.decode(sys.stdin.encoding, errors="replace").rstrip("\r\n")
+
+def read_line(prompt: str) -> asyncio.Future:
+    """
+    Read a line of console input on a daemon thread. Unlike a default
+    executor worker, a read still blocked at Ctrl-C or exit does not
+    hold up asyncio.run's shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(value, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+    
+    def reader():
+        try:
+            value, error = _input_line(prompt), None
+        except BaseException as e:
+            value, error = None, e
+        try:
+            loop.call_soon_threadsafe(resolve, value, error)
+        except RuntimeError:
+            pass  # The loop closed while this read was pending
+    
+    threading.Thread(target=reader, name="console-input", daemon=True).start()
+    return future
+
 class UnifiedCADClient:
     """Main unified client with Ollama integration for both AutoCAD and ETABS"""
+    __slots__ = ("interpreter", "autocad_connected", "etabs_connected",
+                 "autocad_available", "etabs_available")
     
     def __init__(self):
         self.interpreter = UnifiedCADInterpreter()
         self.autocad_connected = False
         self.etabs_connected = False
         
+    async def _probe(self, http_client: httpx.AsyncClient, base: str) -> Optional[bool]:
+        """Probe a server's /health: True if ready, False if not ready, None if unreachable"""
+        try:
+            response = await http_client.get(f"{base}/health", timeout=2.0)
+            return response.status_code == 200
+        except Exception:
+            return None
+    
     async def check_servers(self):
         """Check availability of both servers"""
         console.print("\n[yellow]Checking server availability...[/yellow]")
         
+        # Both probes run concurrently, through the clients' own pools so
+        # the warm connection is reused by connect/create_objects afterwards
+        autocad_status, etabs_status = await asyncio.gather(
+            self._probe(self.interpreter.autocad_client.http_client, AUTOCAD_BASE),
+            self._probe(self.interpreter.etabs_client.http_client, ETABS_BASE)
+        )
+        
         # Check AutoCAD
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{AUTOCAD_BASE}/health", timeout=2.0)
-                if response.status_code == 200:
-                    console.print(f"[green]✓ AutoCAD server available at {WINDOWS_SERVER}:8000[/green]")
-                    self.autocad_available = True
-                else:
-                    console.print(f"[yellow]⚠ AutoCAD server responding but not ready[/yellow]")
-                    self.autocad_available = False
-        except:
+        if autocad_status:
+            console.print(f"[green]✓ AutoCAD server available at {WINDOWS_SERVER}:8000[/green]")
+        elif autocad_status is False:
+            console.print(f"[yellow]⚠ AutoCAD server responding but not ready[/yellow]")
+        else:
             console.print(f"[red]✗ AutoCAD server not available[/red]")
-            self.autocad_available = False
+        self.autocad_available = bool(autocad_status)
         
         # Check ETABS
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{ETABS_BASE}/health", timeout=2.0)
-                if response.status_code == 200:
-                    console.print(f"[green]✓ ETABS server available at {WINDOWS_SERVER}:8001[/green]")
-                    self.etabs_available = True
-                else:
-                    console.print(f"[yellow]⚠ ETABS server responding but not ready[/yellow]")
-                    self.etabs_available = False
-        except:
+        if etabs_status:
+            console.print(f"[green]✓ ETABS server available at {WINDOWS_SERVER}:8001[/green]")
+        elif etabs_status is False:
+            console.print(f"[yellow]⚠ ETABS server responding but not ready[/yellow]")
+        else:
             console.print(f"[red]✗ ETABS server not available[/red]")
-            self.etabs_available = False
+        self.etabs_available = bool(etabs_status)
+    
+    async def _connect_autocad(self):
+        result = await self.interpreter.autocad_client.connect_http()
+        if result.get("success"):
+            console.print("[green]✓ Connected to AutoCAD[/green]")
+            await self.interpreter.autocad_client.new_drawing()
+            self.autocad_connected = True
+        else:
+            console.print(f"[red]✗ AutoCAD connection failed: {result.get('message')}[/red]")
+            self.autocad_connected = False
+    
+    async def _connect_etabs(self):
+        result = await self.interpreter.etabs_client.connect()
+        if result.get("success"):
+            console.print("[green]✓ Connected to ETABS[/green]")
+            units = await self.interpreter.etabs_client.get_units()
+            console.print(f"[cyan]  ETABS Units: {units.get('units', 'Unknown')}[/cyan]")
+            self.etabs_connected = True
+        else:
+            console.print(f"[red]✗ ETABS connection failed: {result.get('message')}[/red]")
+            self.etabs_connected = False
     
     async def connect_services(self):
         """Connect to available services"""
         console.print("\n[yellow]Connecting to services...[/yellow]")
         
+        # The two servers are independent, so connect to them concurrently
+        connects = []
         if self.autocad_available:
-            result = await self.interpreter.autocad_client.connect_http()
-            if result.get("success"):
-                console.print("[green]✓ Connected to AutoCAD[/green]")
-                await self.interpreter.autocad_client.new_drawing()
-                self.autocad_connected = True
-            else:
-                console.print(f"[red]✗ AutoCAD connection failed: {result.get('message')}[/red]")
-                self.autocad_connected = False
-        
+            connects.append(self._connect_autocad())
         if self.etabs_available:
-            result = await self.interpreter.etabs_client.connect()
-            if result.get("success"):
-                console.print("[green]✓ Connected to ETABS[/green]")
-                units = await self.interpreter.etabs_client.get_units()
-                console.print(f"[cyan]  ETABS Units: {units.get('units', 'Unknown')}[/cyan]")
-                self.etabs_connected = True
-            else:
-                console.print(f"[red]✗ ETABS connection failed: {result.get('message')}[/red]")
-                self.etabs_connected = False
+            connects.append(self._connect_etabs())
+        await asyncio.gather(*connects)
     
     def show_status(self):
         """Show connection status"""
@@ -559,6 +961,31 @@ class UnifiedCADClient:
         
         console.print(table)
     
+    async def read_command(self, prompt: str) -> str:
+        """Read a command off the event loop, flushing queued objects if the prompt idles"""
+        # Report earlier idle flushes before the prompt is drawn
+        self.interpreter.show_deferred_reports()
+        line = read_line(prompt)
+        try:
+            return await asyncio.wait_for(asyncio.shield(line), timeout=IDLE_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            # The user is typing at the prompt, so this flush stays silent
+            await self.interpreter.flush_batch(quiet=True)
+            return await line
+    
+    async def keep_connections_warm(self):
+        """Ping connected servers periodically so the pooled connections stay open"""
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            probes = []
+            if self.autocad_connected:
+                probes.append(self.interpreter.autocad_client.http_client.get(
+                    f"{AUTOCAD_BASE}/health", timeout=2.0))
+            if self.etabs_connected:
+                probes.append(self.interpreter.etabs_client.http_client.get(
+                    f"{ETABS_BASE}/health", timeout=2.0))
+            await asyncio.gather(*probes, return_exceptions=True)
+    
     async def run(self):
         """Run the unified client"""
         console.print(Panel.fit(
@@ -592,12 +1019,15 @@ class UnifiedCADClient:
             console.print("  • add a column at position 10,10 with height 4m")
             console.print("  • create a beam from 0,0,3.5 to 6,0,3.5")
         
-        console.print("\n[bold]Other commands:[/bold] status, switch, save, exit")
+        console.print("\n[bold]Other commands:[/bold] status, switch, save, flush, exit")
+        
+        # Input is read on a worker thread, so this keeps running at the prompt
+        keepalive_task = asyncio.create_task(self.keep_connections_warm())
         
         # Main loop
         while True:
             try:
-                user_input = console.input("\n[cyan]Enter command: [/cyan]")
+                user_input = await self.read_command("\n[cyan]Enter command: [/cyan]")
                 
                 if user_input.lower() in ['exit', 'quit', 'q']:
                     break
@@ -605,6 +1035,9 @@ class UnifiedCADClient:
                 elif user_input.lower() == 'status':
                     self.show_status()
                 
+                elif user_input.lower() == 'flush':
+                    await self.interpreter.flush_batch()
+                
                 elif user_input.lower() == 'switch':
                     if self.interpreter.current_app == "autocad":
                         self.interpreter.current_app = "etabs"
@@ -634,17 +1067,23 @@ class UnifiedCADClient:
                         elif target_app == "etabs" and not self.etabs_connected:
                             console.print("[red]ETABS is not connected[/red]")
                         else:
-                            console.print(f"[cyan]Interpreted as: {command}[/cyan]")
+                            show_command("Interpreted as:", command)
                             await self.interpreter.execute_command(command)
                     else:
                         console.print("[red]Could not understand command. Try being more specific.[/red]")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError, asyncio.CancelledError):
                 break
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
         
         # Cleanup
+        keepalive_task.cancel()
+        if self.etabs_connected:
+            try:
+                await self.interpreter.flush_batch()
+            except Exception as e:
+                console.print(f"[red]Error: {e}[/red]")
         await self.interpreter.autocad_client.close()
         await self.interpreter.etabs_client.close()
         console.print("[green]Goodbye![/green]")
@@ -667,12 +1106,15 @@ async def quick_test():
     for prompt in test_prompts:
         console.print(f"\n[bold]Testing:[/bold] {prompt}")
         command = await client.interpreter.process_with_llm(prompt)
-        console.print(f"[cyan]Parsed:[/cyan] {command}")
+        show_command("Parsed:", command)
         if command.get("action") != "unknown":
             await client.interpreter.execute_command(command)
+    
+    await client.interpreter.flush_batch()
 
 if __name__ == "__main__":
-    import sys
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         asyncio.run(quick_test())
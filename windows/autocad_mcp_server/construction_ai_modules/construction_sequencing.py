@@ -15,6 +15,90 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Numba compiles the activity-network passes when installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _topological_order(indptr, indices, n):
+    """
+    Kahn's algorithm over a CSR successor graph (predecessor -> successor).
+    Returns the activity indices in dependency order; shorter than n if the
+    network has a cycle.
+    """
+    in_degree = np.zeros(n, dtype=np.int32)
+    for k in range(indices.shape[0]):
+        in_degree[indices[k]] += 1
+    # Every node is queued exactly once, so the queue never wraps
+    queue = np.empty(n, dtype=np.int32)
+    head = 0
+    tail = 0
+    for u in range(n):
+        if in_degree[u] == 0:
+            queue[tail] = u
+            tail += 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue[tail] = v
+                tail += 1
+    return queue[:tail]
+
+
+def _cpm_passes(indptr, indices, order, durations):
+    """
+    CPM forward and backward passes along a topological order.
+    Returns (early_start, late_start); late_start stays inf for activities
+    that cannot reach a project-finishing activity.
+    """
+    n = durations.shape[0]
+    early_start = np.zeros(n)
+    early_finish = np.zeros(n)
+    for u in order:
+        early_finish[u] = early_start[u] + durations[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if early_finish[u] > early_start[v]:
+                early_start[v] = early_finish[u]
+    project_duration = early_finish.max()
+    
+    late_start = np.full(n, np.inf)
+    late_finish = np.full(n, np.inf)
+    for i in range(order.shape[0] - 1, -1, -1):
+        u = order[i]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if late_finish[u] > late_start[v]:
+                late_finish[u] = late_start[v]
+                late_start[u] = late_finish[u] - durations[u]
+        if early_finish[u] == project_duration:
+            late_finish[u] = project_duration
+            late_start[u] = project_duration - durations[u]
+    return early_start, late_start
+
+
+if NUMBA_AVAILABLE:
+    _topological_order = njit(cache=True)(_topological_order)
+    _cpm_passes = njit(cache=True)(_cpm_passes)
+
+
+def activity_network(activities) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR (indptr, indices) of predecessor -> successor links between activities"""
+    index = {activity.id: i for i, activity in enumerate(activities)}
+    sources = np.array([index[pred] for a in activities for pred in a.predecessors], dtype=np.int32)
+    targets = np.array([i for i, a in enumerate(activities) for _ in a.predecessors], dtype=np.int32)
+    by_source = np.argsort(sources, kind='stable')
+    indptr = np.zeros(len(activities) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=len(activities)), out=indptr[1:])
+    return indptr, targets[by_source]
+
 class ConstructionPhase(Enum):
     """Construction phases for sequencing"""
     SITE_PREPARATION = "site_preparation"
@@ -348,53 +432,17 @@ class AIConstructionSequencer:
     
     def _calculate_critical_path(self, activities: List[ConstructionActivity]) -> List[str]:
         """Calculate critical path using CPM algorithm"""
-        # Build activity network
-        network = {}
-        for activity in activities:
-            network[activity.id] = {
-                'duration': activity.duration_days,
-                'predecessors': activity.predecessors,
-                'early_start': 0,
-                'early_finish': 0,
-                'late_start': float('inf'),
-                'late_finish': float('inf'),
-                'slack': 0
-            }
-        
-        # Forward pass
-        for activity in activities:
-            if not activity.predecessors:
-                network[activity.id]['early_start'] = 0
-                network[activity.id]['early_finish'] = activity.duration_days
-            else:
-                max_finish = max([network[pred]['early_finish'] 
-                                for pred in activity.predecessors])
-                network[activity.id]['early_start'] = max_finish
-                network[activity.id]['early_finish'] = max_finish + activity.duration_days
-        
-        # Find project completion time
-        project_duration = max([network[a]['early_finish'] for a in network])
-        
-        # Backward pass
-        for activity in reversed(activities):
-            if network[activity.id]['early_finish'] == project_duration:
-                network[activity.id]['late_finish'] = project_duration
-                network[activity.id]['late_start'] = project_duration - activity.duration_days
-            
-            for pred_id in activity.predecessors:
-                if network[pred_id]['late_finish'] > network[activity.id]['late_start']:
-                    network[pred_id]['late_finish'] = network[activity.id]['late_start']
-                    network[pred_id]['late_start'] = network[pred_id]['late_finish'] - \
-                                                     network[pred_id]['duration']
-        
-        # Calculate slack and identify critical path
-        critical_path = []
-        for activity_id, data in network.items():
-            data['slack'] = data['late_start'] - data['early_start']
-            if data['slack'] == 0:
-                critical_path.append(activity_id)
-        
-        return critical_path
+        indptr, indices = activity_network(activities)
+        order = _topological_order(indptr, indices, len(activities))
+        if len(order) < len(activities):
+            raise ValueError("Construction activities contain a dependency cycle")
+        
+        durations = np.array([a.duration_days for a in activities], dtype=np.float64)
+        early_start, late_start = _cpm_passes(indptr, indices, order, durations)
+        
+        # Zero slack marks the critical path
+        slack = late_start - early_start
+        return [activity.id for activity, activity_slack in zip(activities, slack) if activity_slack == 0]
     
     def _generate_resource_histogram(self, activities: List[ConstructionActivity]) -> Dict[str, List[int]]:
         """Generate resource usage histogram"""
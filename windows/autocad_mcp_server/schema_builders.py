@@ -0,0 +1,45 @@
+# schema_builders.py
+"""Builders for MCP tool inputSchemas, emitting keys in one fixed order"""
+
+from typing import Dict, List, Optional
+
+_UNSET = object()
+
+
+def _schema(type_: str, description: Optional[str] = None, enum: Optional[List] = None,
+            default=_UNSET, **fields) -> Dict:
+    """type, description, enum, the type-specific fields, then default"""
+    schema = {"type": type_}
+    if description is not None:
+        schema["description"] = description
+    if enum is not None:
+        schema["enum"] = enum
+    schema.update((key, value) for key, value in fields.items() if value is not None)
+    if default is not _UNSET:
+        schema["default"] = default
+    return schema
+
+
+def number(description: Optional[str] = None, default=_UNSET) -> Dict:
+    return _schema("number", description, default=default)
+
+
+def integer(description: Optional[str] = None, default=_UNSET) -> Dict:
+    return _schema("integer", description, default=default)
+
+
+def boolean(description: Optional[str] = None, default=_UNSET) -> Dict:
+    return _schema("boolean", description, default=default)
+
+
+def string(description: Optional[str] = None, enum: Optional[List[str]] = None, default=_UNSET) -> Dict:
+    return _schema("string", description, enum, default=default)
+
+
+def array(items: Optional[Dict] = None, description: Optional[str] = None) -> Dict:
+    return _schema("array", description, items=items)
+
+
+def obj(properties: Optional[Dict[str, Dict]] = None, required: Optional[List[str]] = None,
+        description: Optional[str] = None) -> Dict:
+    return _schema("object", description, properties=properties, required=required)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import sys
+import numpy as np
 import pandas as pd
 import pythoncom
 import win32com.client
@@ -47,7 +48,8 @@ def recreate_in_autocad():
     
     for mesh in MESHES:
         try:
-            vertices = mesh['vertices']
+            # One bulk float conversion per mesh instead of per coordinate
+            vertices = np.asarray(mesh['vertices'], dtype=np.float64).tolist()
             faces = mesh['faces']
             layer = mesh['layer']
             color = mesh['color']
@@ -70,14 +72,8 @@ def recreate_in_autocad():
                     continue
                 
                 # Create 3DFACE
-                p1 = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, 
-                                            [float(pts[0][0]), float(pts[0][1]), float(pts[0][2])])
-                p2 = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8,
-                                            [float(pts[1][0]), float(pts[1][1]), float(pts[1][2])])
-                p3 = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8,
-                                            [float(pts[2][0]), float(pts[2][1]), float(pts[2][2])])
-                p4 = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8,
-                                            [float(pts[3][0]), float(pts[3][1]), float(pts[3][2])])
+                p1, p2, p3, p4 = (win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, pt)
+                                  for pt in pts)
                 
                 face = modelspace.Add3DFace(p1, p2, p3, p4)
                 face.Layer = layer
@@ -22,6 +22,8 @@ Reference building specifications:
 import logging
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -67,6 +69,33 @@ SIMPLE_BUILDING = {
 }
 
 
+# Unit box faces (bottom, top, front, back, left, right), 4 corners each
+_UNIT_BOX_FACES = np.array([
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+    [(0, 1, 0), (1, 1, 0), (1, 1, 1), (0, 1, 1)],
+    [(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)],
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+], dtype=np.float64)
+
+
+def _box_faces(corners, sizes):
+    """
+    Face corners of N axis-aligned boxes in one broadcast.
+    corners, sizes: (N, 3) arrays of min corner and (lx, ly, lz).
+    Returns an (N, 6, 4, 3) array.
+    """
+    corners = np.asarray(corners, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    return _UNIT_BOX_FACES * sizes[:, None, None, :] + corners[:, None, None, :]
+
+
+def _wall_size(wl, wt, wh, orient):
+    """(lx, ly, lz) of a wall box for its orientation."""
+    return (wl, wt, wh) if orient == "x" else (wt, wl, wh)
+
+
 def _make_point(x, y, z):
     """Create a COM-compatible 3D point."""
     import win32com.client
@@ -96,20 +125,13 @@ def _add_wall_box(ms, x, y, z, wl, wt, wh, orient, layer=None):
     orient='x': wall runs along x-axis (length=wl in x, thickness=wt in y)
     orient='y': wall runs along y-axis (thickness=wt in x, length=wl in y)
     """
-    if orient == "x":
-        lx, ly = wl, wt
-    else:
-        lx, ly = wt, wl
+    faces = _box_faces([(x, y, z)], [_wall_size(wl, wt, wh, orient)])[0]
+    return _add_box_faces(ms, faces.tolist(), layer)
 
+
+def _add_box_faces(ms, faces_pts, layer=None):
+    """Add precomputed box faces as 3DFaces and return how many were created."""
     count = 0
-    faces_pts = [
-        ((x, y, z), (x+lx, y, z), (x+lx, y+ly, z), (x, y+ly, z)),
-        ((x, y, z+wh), (x+lx, y, z+wh), (x+lx, y+ly, z+wh), (x, y+ly, z+wh)),
-        ((x, y, z), (x+lx, y, z), (x+lx, y, z+wh), (x, y, z+wh)),
-        ((x, y+ly, z), (x+lx, y+ly, z), (x+lx, y+ly, z+wh), (x, y+ly, z+wh)),
-        ((x, y, z), (x, y+ly, z), (x, y+ly, z+wh), (x, y, z+wh)),
-        ((x+lx, y, z), (x+lx, y+ly, z), (x+lx, y+ly, z+wh), (x+lx, y, z+wh)),
-    ]
     for pts in faces_pts:
         face = _add_3dface(ms, *pts)
         if face:
@@ -157,6 +179,22 @@ def recreate_in_autocad(autocad_controller):
     _ensure_layer(doc, "S-SLAB", 4)
     _ensure_layer(doc, "S-WALL", 1)
 
+    # Wall box faces for every floor at once: (floors, walls, 6, 4, 3)
+    walls = b["shear_walls"]
+    wall_h = b["floor_height"] - b["slab_thickness"]
+    floor_z = np.arange(b["floors"]) * b["floor_height"] + b["slab_thickness"]
+    plan = np.array([(w["x"], w["y"]) for w in walls], dtype=np.float64)
+    corners = np.empty((b["floors"], len(walls), 3))
+    corners[:, :, :2] = plan
+    corners[:, :, 2] = floor_z[:, None]
+    sizes = np.array([
+        _wall_size(b["wall_length"], b["wall_thickness"], wall_h, w["orient"])
+        for w in walls
+    ], dtype=np.float64)
+    wall_faces = _box_faces(
+        corners.reshape(-1, 3), np.tile(sizes, (b["floors"], 1))
+    ).reshape(b["floors"], len(walls), 6, 4, 3).tolist()
+
     for floor_idx in range(b["floors"]):
         z_base = floor_idx * b["floor_height"]
 
@@ -193,18 +231,8 @@ def recreate_in_autocad(autocad_controller):
             total += 1
 
         # Shear walls for this floor
-        wall_z = z_base + b["slab_thickness"]
-        wall_h = b["floor_height"] - b["slab_thickness"]
-
-        for wall_def in b["shear_walls"]:
-            n = _add_wall_box(
-                ms,
-                wall_def["x"], wall_def["y"], wall_z,
-                b["wall_length"], b["wall_thickness"], wall_h,
-                wall_def["orient"],
-                layer="S-WALL"
-            )
-            total += n
+        for faces_pts in wall_faces[floor_idx]:
+            total += _add_box_faces(ms, faces_pts, layer="S-WALL")
 
     # Top roof slab
     z_top = b["floors"] * b["floor_height"]
@@ -9,11 +9,15 @@ import sys
 import math
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 
 # Configure logging to stderr (not stdout) to avoid breaking MCP JSON
 logging.basicConfig(level=logging.WARNING, format='%(message)s', stream=sys.stderr)
 
+# Parsed standards per data directory, shared by every StandardsManager
+_STANDARDS_CACHE: Dict[Path, Mapping[str, Dict]] = {}
+
 class StandardsManager:
     """
     Central manager for querying building design standards
@@ -22,11 +26,14 @@ class StandardsManager:
     
     def __init__(self):
         self.data_dir = Path(__file__).parent / 'data'
-        self._cache = {}
-        self._load_all_standards()
+        if self.data_dir not in _STANDARDS_CACHE:
+            self._cache = {}
+            self._load_all_standards()
+            _STANDARDS_CACHE[self.data_dir] = MappingProxyType(self._cache)
+        self._cache = _STANDARDS_CACHE[self.data_dir]
     
     def _load_all_standards(self):
-        """Load all JSON standard files into memory"""
+        """Load all JSON standard files into memory (once per process)"""
         standard_files = [
             ('aci_318_concrete', 'materials/aci_318_concrete.json'),
             ('aci_318_complete', 'materials/aci_318_complete.json'),
@@ -0,0 +1,54 @@
+# validation_kernels.py
+"""Compiled geometry checks over extracted AutoCAD face arrays"""
+
+import numpy as np
+
+# Numba compiles the per-face loops when installed; otherwise use NumPy
+try:
+    import numba
+    from numba import prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def _extract_and_validate_loops(faces, tri_areas, flags, tolerance):
+    """
+    Single pass over quad faces (N, 4, 3) filling preallocated outputs:
+    tri_areas[f] is the area of triangle (0, 1, 2), used for volumes and
+    formwork; flags[f] is 1 where the whole quad has zero area.
+    """
+    n = faces.shape[0]
+    for f in prange(n):
+        quad = 0.0
+        for t in range(2):
+            ax = faces[f, t + 1, 0] - faces[f, 0, 0]
+            ay = faces[f, t + 1, 1] - faces[f, 0, 1]
+            az = faces[f, t + 1, 2] - faces[f, 0, 2]
+            bx = faces[f, t + 2, 0] - faces[f, 0, 0]
+            by = faces[f, t + 2, 1] - faces[f, 0, 1]
+            bz = faces[f, t + 2, 2] - faces[f, 0, 2]
+            cx = ay * bz - az * by
+            cy = az * bx - ax * bz
+            cz = ax * by - ay * bx
+            area = 0.5 * np.sqrt(cx * cx + cy * cy + cz * cz)
+            if t == 0:
+                tri_areas[f] = area
+            quad += area
+        flags[f] = 1 if quad <= tolerance else 0
+
+
+def _extract_and_validate_numpy(faces, tri_areas, flags, tolerance):
+    """Vectorized fallback for _extract_and_validate_loops"""
+    origin = faces[:, 0]
+    first = 0.5 * np.linalg.norm(np.cross(faces[:, 1] - origin, faces[:, 2] - origin), axis=1)
+    second = 0.5 * np.linalg.norm(np.cross(faces[:, 2] - origin, faces[:, 3] - origin), axis=1)
+    tri_areas[:] = first
+    flags[:] = (first + second) <= tolerance
+
+
+if NUMBA_AVAILABLE:
+    extract_and_validate = numba.njit(parallel=True, cache=True, fastmath=True)(_extract_and_validate_loops)
+else:
+    extract_and_validate = _extract_and_validate_numpy
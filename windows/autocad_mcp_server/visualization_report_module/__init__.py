@@ -1,8 +1,16 @@
-try:
-    from .visualization_report_module import ComprehensiveConstructionReportGenerator
-except ImportError:
-    pass
-try:
-    from .modern_gantt_with_metrics import ModernConstructionGantt
-except ImportError:
-    pass
+import importlib
+
+# Resolved on first attribute access (PEP 562) so importing the package, or
+# locating its submodules, does not pull in matplotlib and pandas
+_LAZY_ATTRS = {
+    'ComprehensiveConstructionReportGenerator': '.visualization_report_module',
+    'ModernConstructionGantt': '.modern_gantt_with_metrics',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -5,6 +5,8 @@ Shows real-time standards data: ACI 318 calculations, ACI 347 formwork, producti
 NO emojis, clean professional output
 """
 
+import functools
+import pickle
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.gridspec import GridSpec
@@ -14,6 +16,41 @@ import numpy as np
 from typing import List, Dict, Any, Optional
 
 
+@functools.lru_cache(maxsize=4)
+def _figure_template(figsize: tuple) -> bytes:
+    """
+    Pickled figure skeleton (GridSpec layout plus task-independent Gantt styling),
+    built once per figure size and unpickled for each chart
+    """
+    fig = plt.figure(figsize=figsize, facecolor='white')
+    gs = GridSpec(1, 3, figure=fig, wspace=0.3)
+    ax_gantt = fig.add_subplot(gs[0, :2])
+    fig.add_subplot(gs[0, 2])
+    
+    # X-axis
+    ax_gantt.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+    ax_gantt.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
+    
+    # Grid
+    ax_gantt.grid(True, axis='x', alpha=0.2, linestyle='--', linewidth=0.5)
+    ax_gantt.set_axisbelow(True)
+    
+    # Spines
+    ax_gantt.spines['top'].set_visible(False)
+    ax_gantt.spines['right'].set_visible(False)
+    
+    # Background
+    ax_gantt.set_facecolor('#FAFAFA')
+    
+    # Labels
+    ax_gantt.set_xlabel('Timeline', fontsize=12, fontweight='bold')
+    ax_gantt.set_ylabel('Tasks (Sequential Floor Order)', fontsize=12, fontweight='bold')
+    
+    blob = pickle.dumps(fig)
+    plt.close(fig)
+    return blob
+
+
 class ModernConstructionGantt:
     """Modern Gantt with standards metrics panel - FIXED floor ordering"""
     
@@ -55,15 +92,11 @@ class ModernConstructionGantt:
         if start_date is None:
             start_date = datetime.now()
         
-        # Create figure with GridSpec (70% Gantt, 30% Metrics)
-        self.fig = plt.figure(figsize=self.figsize, facecolor='white')
-        gs = GridSpec(1, 3, figure=self.fig, wspace=0.3)
+        # Figure with GridSpec (70% Gantt, 30% Metrics) from the cached template
+        self.fig = pickle.loads(_figure_template(tuple(self.figsize)))
         
-        # Main Gantt chart area
-        self.ax_gantt = self.fig.add_subplot(gs[0, :2])
-        
-        # Metrics panel
-        self.ax_metrics = self.fig.add_subplot(gs[0, 2])
+        # Main Gantt chart area and metrics panel
+        self.ax_gantt, self.ax_metrics = self.fig.axes
         
         # Process and draw tasks - FIXED: maintain sequential floor order
         processed_tasks = self._process_tasks_sequential(tasks, start_date)
@@ -409,26 +442,9 @@ class ModernConstructionGantt:
         self.ax_gantt.set_yticklabels(task_names, fontsize=9)
         self.ax_gantt.set_ylim(-0.5, len(tasks) - 0.5)
         
-        # X-axis
-        self.ax_gantt.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-        self.ax_gantt.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
+        # X-axis (formatter, locator, grid, spines and labels come from the template)
         plt.setp(self.ax_gantt.xaxis.get_majorticklabels(), rotation=45, ha='right')
         
-        # Grid
-        self.ax_gantt.grid(True, axis='x', alpha=0.2, linestyle='--', linewidth=0.5)
-        self.ax_gantt.set_axisbelow(True)
-        
-        # Spines
-        self.ax_gantt.spines['top'].set_visible(False)
-        self.ax_gantt.spines['right'].set_visible(False)
-        
-        # Background
-        self.ax_gantt.set_facecolor('#FAFAFA')
-        
-        # Labels
-        self.ax_gantt.set_xlabel('Timeline', fontsize=12, fontweight='bold')
-        self.ax_gantt.set_ylabel('Tasks (Sequential Floor Order)', fontsize=12, fontweight='bold')
-        
         # Legend
         legend_elements = []
         used_categories = set(t['category'].lower() for t in tasks)
@@ -30,6 +30,10 @@ from construction_ai_modules.construction_pattern_learner import ConstructionPat
 from standards_module import get_standards_manager
 
 
+# Wall-clock stamps use time.strftime (C-level) instead of datetime objects
+ISO_TIMESTAMP = '%Y-%m-%dT%H:%M:%S'
+
+
 class PerformanceTracker:
     """Track Claudeâ†’MCPâ†’AutoCAD communication timing"""
     
@@ -41,16 +45,16 @@ class PerformanceTracker:
     def start_operation(self, operation_name: str):
         """Start tracking an operation"""
         self.current_operation = operation_name
-        self.operation_start = time.time()
+        self.operation_start = time.monotonic_ns()
         
     def end_operation(self, details: Dict = None):
         """End tracking and record metrics"""
-        if self.current_operation and self.operation_start:
-            duration = time.time() - self.operation_start
+        if self.current_operation and self.operation_start is not None:
+            duration = (time.monotonic_ns() - self.operation_start) * 1e-9
             metric = {
                 'operation': self.current_operation,
                 'duration_seconds': duration,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': time.strftime(ISO_TIMESTAMP),
                 'details': details or {}
             }
             self.metrics.append(metric)
@@ -116,6 +120,9 @@ class ComprehensiveConstructionReportGenerator:
         # Module usage tracking
         self.modules_used = []
         
+        # Wall-clock time of the report in progress, formatted on demand
+        self.report_time = time.localtime()
+        
         # CRITICAL: Initialize standards manager for COMPLETE standards integration
         # Now handles scheduling via generate_shear_wall_building_schedule()
         self.standards_mgr = get_standards_manager()
@@ -379,7 +386,7 @@ class ComprehensiveConstructionReportGenerator:
     def _track_module_usage(self, module_name: str, function_name: str, result: any):
         """Track which module functions were called"""
         self.modules_used.append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.strftime(ISO_TIMESTAMP),
             'module': module_name,
             'function': function_name,
             'success': result is not None
@@ -422,7 +429,8 @@ class ComprehensiveConstructionReportGenerator:
         
         # Create output directory with building name and timestamp
         building_name = building_data.get('name', 'unnamed_building')
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.report_time = time.localtime()
+        timestamp = time.strftime('%Y%m%d_%H%M%S', self.report_time)
         report_dir = Path(output_base_dir) / f"{building_name}_{timestamp}"
         report_dir.mkdir(parents=True, exist_ok=True)
         
@@ -1186,7 +1194,7 @@ Standards Applied:
         report_content = f"""# Construction Analysis Report
 ## {building_data.get('name', 'Building Project')}
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S', self.report_time)}  
 **Analysis Method:** AI-Powered Construction Modules  
 **Standards Referenced:** ACI 318-19, RSMeans 2024, ASCE 7-22
 